@@ -1,7 +1,8 @@
 """REST client handling, including GoogleBusinessStream base class."""
 
+import json
 from backports.cached_property import cached_property
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 import requests
 from singer_sdk.authenticators import OAuthAuthenticator
@@ -23,6 +24,9 @@ class GoogleBusinessStream(RESTStream):
     records_jsonpath = "$[*]"  # Or override `parse_response`.
     next_page_token_jsonpath = "$.nextPageToken"  # Or override `get_next_page_token`.
     _LOG_REQUEST_METRIC_URLS: bool = True
+    # Order in which child streams of a location are synced, lowest first. Streams
+    # without a priority are synced last.
+    sync_priority: Optional[int] = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -85,6 +89,16 @@ class GoogleBusinessStream(RESTStream):
             auth_headers=auth_headers,
         )
 
+    @cached_property
+    def plan(self) -> Optional[dict]:
+        """Return the plan written by `--plan`, if one was provided."""
+        plan_file = self.config.get("plan_file")
+        if not plan_file:
+            return None
+
+        with open(plan_file) as f:
+            return json.load(f)
+
     @property
     def http_headers(self) -> dict:
         """Return the http headers needed."""
@@ -108,6 +122,62 @@ class GoogleBusinessStream(RESTStream):
         except ResumableAPIError as e:
             self.logger.warning(e)
 
+    # Profiling hooks, only active if the sync is profiled
+
+    def _sync_records(
+        self, context: Optional[dict] = None, *, write_messages: bool = True
+    ):
+        records = super()._sync_records(context, write_messages=write_messages)
+        if self._tap.profiler is None:
+            return records
+
+        return self._tap.profiler.partition(self.name, context, records)
+
+    def request_decorator(self, func: Callable) -> Callable:
+        """Return the request function, decorated with retries and timing."""
+        decorator = super().request_decorator(func)
+        if self._tap.profiler is None:
+            return decorator
+
+        return self._tap.profiler.timed(self.name, "request", decorator)
+
+    def prepare_request(
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> requests.PreparedRequest:
+        """Prepare a request object, timed so it is not counted as parsing."""
+        prepare_request = super().prepare_request
+        if self._tap.profiler is not None:
+            prepare_request = self._tap.profiler.timed(
+                self.name, "prepare", prepare_request
+            )
+
+        return prepare_request(context, next_page_token)
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request records from REST endpoint(s), returning response records."""
+        records = super().request_records(context)
+        if self._tap.profiler is None:
+            return records
+
+        return self._tap.profiler.timed_iter(self.name, "request_records", records)
+
+    def _generate_record_messages(self, record: dict):
+        record_messages = super()._generate_record_messages(record)
+        if self._tap.profiler is None:
+            return record_messages
+
+        return self._tap.profiler.timed_iter(self.name, "map", record_messages)
+
+    def _write_record_message(self, record: dict) -> None:
+        if self._tap.profiler is None:
+            super()._write_record_message(record)
+            return
+
+        # Includes mapping the record, which is subtracted when writing the profile
+        self._tap.profiler.timed(
+            self.name, "map_and_write", super()._write_record_message
+        )(record)
+
 class GoogleBusinessPerformanceStream(GoogleBusinessStream):
     """GoogleBusinessPerformance stream class."""
 
@@ -0,0 +1,91 @@
+"""Request planning and quota estimation for tap-google-business."""
+
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import requests
+
+from tap_google_business.streams import AccountsStream, LocationsStream
+
+if TYPE_CHECKING:
+    from tap_google_business.tap import TapGoogleBusiness
+
+DEFAULT_REQUEST_SECONDS = 1.0
+
+
+def build_plan(tap: "TapGoogleBusiness") -> Dict[str, Any]:
+    """Enumerate accounts and locations and estimate the requests of a sync.
+
+    Only the accounts and locations are requested. Every other selected stream is
+    counted as one request per parent record; additional pages are not included.
+    The returned plan can be passed back as `plan_file`, in which case a sync does
+    not request accounts and locations again.
+    """
+    request_seconds: List[float] = []
+
+    def _time_response(response: requests.Response, *args, **kwargs) -> None:
+        request_seconds.append(response.elapsed.total_seconds())
+
+    accounts_stream = tap.streams[AccountsStream.name]
+    locations_stream = tap.streams[LocationsStream.name]
+
+    for stream in (accounts_stream, locations_stream):
+        stream.requests_session.hooks["response"].append(_time_response)
+
+    accounts = list(accounts_stream.get_records(None))
+    locations = {
+        account["name"]: list(
+            locations_stream.get_records({"account_name": account["name"]})
+        )
+        for account in accounts
+    }
+
+    parent_record_counts = {
+        AccountsStream: len(accounts),
+        LocationsStream: sum(len(records) for records in locations.values()),
+    }
+
+    stream_requests = {
+        stream.name: parent_record_counts[stream.parent_stream_type]
+        for stream in tap.streams.values()
+        if stream.selected
+        and stream.parent_stream_type in parent_record_counts
+        and not isinstance(stream, LocationsStream)
+    }
+
+    total_requests = sum(stream_requests.values())
+    concurrency = tap.config.get("plan_concurrency", 1)
+    requests_per_minute = tap.config.get("requests_per_minute", 300)
+    mean_request_seconds = (
+        sum(request_seconds) / len(request_seconds)
+        if request_seconds
+        else DEFAULT_REQUEST_SECONDS
+    )
+
+    def _estimate(requests_count: int) -> Dict[str, Any]:
+        return {
+            "requests": requests_count,
+            "quota_minutes": round(requests_count / requests_per_minute, 2),
+            "wall_seconds": round(
+                max(
+                    requests_count * mean_request_seconds / concurrency,
+                    requests_count / requests_per_minute * 60,
+                ),
+                1,
+            ),
+        }
+
+    return {
+        "accounts": accounts,
+        "locations": locations,
+        "enumeration_requests": len(request_seconds),
+        "requests": stream_requests,
+        "total_requests": total_requests,
+        "estimate": {
+            "concurrency": concurrency,
+            "requests_per_minute": requests_per_minute,
+            "mean_request_seconds": round(mean_request_seconds, 3),
+            # A sync without `plan_file` requests the accounts and locations again
+            "without_plan_file": _estimate(total_requests + len(request_seconds)),
+            "with_plan_file": _estimate(total_requests),
+        },
+    }
@@ -0,0 +1,192 @@
+"""Opt-in profiling for tap-google-business syncs."""
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, DefaultDict, Dict, Iterable, Iterator, List, Optional
+
+SAMPLE_INTERVAL_SECONDS = 0.01
+
+
+class Profiler:
+    """Collect CPU samples, peak memory and section timings during a sync.
+
+    CPU samples are taken every `SAMPLE_INTERVAL_SECONDS` of CPU time and
+    attributed to the stream currently syncing. Peak memory is traced per
+    partition, i.e. per stream sync of a single context, if `trace_memory` is set.
+    Tracing memory slows the sync down considerably, which also skews the section
+    timings. Section timings are accumulated per stream.
+    """
+
+    def __init__(
+        self, profiling_dir: str, logger: logging.Logger, trace_memory: bool = True
+    ) -> None:
+        """Initialize the profiler, writing to a new directory in `profiling_dir`."""
+        self.logger = logger
+        self.trace_memory = trace_memory
+        self._sampling_cpu = False
+        self.profiling_dir = os.path.join(
+            profiling_dir, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        )
+        self._streams: List[str] = []
+        self._memory_peaks: List[int] = []
+        self._cpu_samples: DefaultDict[str, Counter] = defaultdict(Counter)
+        self._timings: DefaultDict[str, DefaultDict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self._partitions: List[Dict[str, Any]] = []
+
+    def start(self) -> None:
+        """Start tracing memory and sampling CPU."""
+        if self.trace_memory:
+            tracemalloc.start()
+
+        # CPU sampling relies on SIGPROF, which is not available on Windows, and
+        # signal handlers can only be set from the main thread
+        if not hasattr(signal, "setitimer"):
+            self.logger.warning("CPU sampling is not available on this platform.")
+        elif threading.current_thread() is not threading.main_thread():
+            self.logger.warning("CPU sampling is only available from the main thread.")
+        else:
+            signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(
+                signal.ITIMER_PROF, SAMPLE_INTERVAL_SECONDS, SAMPLE_INTERVAL_SECONDS
+            )
+            self._sampling_cpu = True
+
+    def stop(self) -> None:
+        """Stop tracing memory and sampling CPU, and write the profile files."""
+        if self._sampling_cpu:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+        if self.trace_memory:
+            tracemalloc.stop()
+
+        self._write()
+
+    def _sample(self, signum, frame) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(f"{frame.f_code.co_name} ({frame.f_code.co_filename})")
+            frame = frame.f_back
+
+        stream_name = self._streams[-1] if self._streams else "tap"
+        self._cpu_samples[stream_name][";".join(reversed(stack))] += 1
+
+    def partition(
+        self, stream_name: str, context: Optional[dict], records: Iterable[dict]
+    ) -> Iterator[dict]:
+        """Profile the sync of a stream partition while iterating its records."""
+        if self._memory_peaks:
+            self._memory_peaks[-1] = max(self._memory_peaks[-1], self._memory_peak())
+
+        self._streams.append(stream_name)
+        self._memory_peaks.append(0)
+        self._reset_memory_peak()
+        started = time.perf_counter()
+
+        try:
+            yield from records
+        finally:
+            seconds = time.perf_counter() - started
+            peak = max(self._memory_peaks.pop(), self._memory_peak())
+            self._streams.pop()
+            self._reset_memory_peak()
+
+            # A partition's peak memory includes that of its child partitions
+            if self._memory_peaks:
+                self._memory_peaks[-1] = max(self._memory_peaks[-1], peak)
+
+            self._partitions.append(
+                {
+                    "stream": stream_name,
+                    "context": context,
+                    "seconds": round(seconds, 6),
+                    "peak_memory_bytes": peak if self.trace_memory else None,
+                }
+            )
+
+    def _memory_peak(self) -> int:
+        return tracemalloc.get_traced_memory()[1]
+
+    def _reset_memory_peak(self) -> None:
+        # Without `reset_peak` (Python < 3.9), peaks are measured from the start
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    # Sections are timed for every record, so the timings avoid context managers
+    # and attribute lookups to keep the overhead low
+
+    def timed(self, stream_name: str, section: str, func: Callable) -> Callable:
+        """Return `func`, timed as a section of a stream sync."""
+        timings = self._timings[stream_name]
+        perf_counter = time.perf_counter
+
+        def _timed(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings[section] += perf_counter() - started
+
+        return _timed
+
+    def timed_iter(
+        self, stream_name: str, section: str, iterable: Iterable[dict]
+    ) -> Iterator[dict]:
+        """Iterate `iterable`, timing each item as a section of a stream sync."""
+        timings = self._timings[stream_name]
+        perf_counter = time.perf_counter
+        iterator = iter(iterable)
+        while True:
+            started = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                timings[section] += perf_counter() - started
+            yield item
+
+    def _write(self) -> None:
+        os.makedirs(self.profiling_dir, exist_ok=True)
+
+        for stream_name, samples in self._cpu_samples.items():
+            with open(
+                os.path.join(self.profiling_dir, f"{stream_name}.folded"), "w"
+            ) as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        timings = {}
+        for stream_name, sections in self._timings.items():
+            # Responses are requested while records are requested and parsed, and
+            # records are mapped while being written
+            parse = (
+                sections["request_records"] - sections["request"] - sections["prepare"]
+            )
+            write = sections["map_and_write"] - sections["map"]
+            timings[stream_name] = {
+                "request": round(sections["request"], 6),
+                "parse": round(parse, 6),
+                "map": round(sections["map"], 6),
+                "write": round(write, 6),
+            }
+
+        with open(os.path.join(self.profiling_dir, "profile.json"), "w") as f:
+            json.dump(
+                {
+                    "sample_interval_seconds": SAMPLE_INTERVAL_SECONDS,
+                    "timings": timings,
+                    "partitions": self._partitions,
+                },
+                f,
+                indent=2,
+            )
@@ -1,7 +1,9 @@
 """Stream type classes for tap-google-business."""
 
+import time
+from itertools import groupby
 from pathlib import Path
-from typing import Iterable, Optional, Any, Dict
+from typing import Iterable, List, Optional, Any, Dict
 
 from singer_sdk import typing as th
 from tap_google_business.client import GoogleBusinessStream, GoogleBusinessPerformanceStream
@@ -22,8 +24,31 @@ class AccountsStream(GoogleBusinessStream):
             yield response.json()
 
     def get_records(self, context: Optional[dict]) -> Iterable[dict]:
-        """Return a generator of row-like dictionary objects."""
-        if self.config.get("account_ids"):
+        """Return a generator of row-like dictionary objects.
+
+        No more accounts are emitted once the sync deadline is reached.
+        """
+        for record in self._get_account_records(context):
+            if self._tap.deadline_reached():
+                self.logger.info(
+                    "Sync deadline reached, stopping before account '%s'.",
+                    record["name"],
+                )
+                return
+            yield record
+
+    def _sync_records(
+        self, context: Optional[dict] = None, *, write_messages: bool = True
+    ):
+        yield from super()._sync_records(context, write_messages=write_messages)
+
+        # Child streams of the locations are synced once all locations are known
+        self._tap.streams[LocationsStream.name].sync_location_streams()
+
+    def _get_account_records(self, context: Optional[dict]) -> Iterable[dict]:
+        if self.plan:
+            yield from self.plan["accounts"]
+        elif self.config.get("account_ids"):
             for account_id in self.config["account_ids"]:
                 self.path = f"/accounts/{account_id}"
                 yield from super().get_records(context)
@@ -129,17 +154,140 @@ class LocationsStream(GoogleBusinessStream):
         )),
     ).to_dict()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._seen_location_ids: set = set()
+        self._location_contexts: List[dict] = []
+        self._longest_child_seconds = 0.0
+
+    def get_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Return a generator of row-like dictionary objects.
+
+        The same location can be listed under several accounts (e.g. a personal
+        account and a location group), so only the first occurrence of each
+        location is emitted. This also means child streams are only synced once
+        per location.
+
+        If a plan is provided, its locations are used instead of requesting them.
+
+        No more locations are emitted once the sync deadline is reached.
+        """
+        if self._tap.sync_stopped:
+            return
+
+        if self.plan:
+            records = self.plan["locations"].get(context["account_name"], [])
+        else:
+            records = super().get_records(context)
+
+        for record in records:
+            location_id = record["name"].rpartition("/")[2]
+            if location_id in self._seen_location_ids:
+                self.logger.debug(
+                    "Skipping location '%s' already synced under another account.",
+                    record["name"],
+                )
+                continue
+
+            if self._tap.deadline_reached():
+                self.logger.info(
+                    "Sync deadline reached, stopping before location '%s'.",
+                    record["name"],
+                )
+                return
+
+            self._seen_location_ids.add(location_id)
+            yield record
+
     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
         return {
             "location_name": record["name"]
         }
 
+    def _sync_children(self, child_context: Optional[dict]) -> None:
+        """Defer syncing child streams until all locations are known.
+
+        See `sync_location_streams`.
+        """
+        if child_context is None:
+            super()._sync_children(child_context)
+            return
+
+        self._location_contexts.append(child_context)
+
+    def sync_location_streams(self) -> None:
+        """Sync the child streams of all locations, in order of `sync_priority`.
+
+        Each priority of child streams is synced for every location before the
+        next, so that recent daily metrics are synced for all locations first, then
+        entity streams, then monthly keyword history. Once the sync deadline is
+        expected to be reached before the next child stream is synced, based on the
+        longest time taken to sync one so far, no more child streams are synced.
+
+        The child streams synced for each location are kept in state as they are
+        synced, so that a sync which stops (or is stopped) early continues where it
+        stopped. They are removed from state once a sync completes.
+        """
+        child_streams = sorted(
+            (
+                child_stream
+                for child_stream in self.child_streams
+                if child_stream.selected or child_stream.has_selected_descendents
+            ),
+            key=self._child_stream_priority,
+        )
+        synced_child_streams = self.stream_state.setdefault("synced_child_streams", {})
+
+        for _, priority_streams in groupby(child_streams, self._child_stream_priority):
+            priority_streams = list(priority_streams)
+
+            for child_context in self._location_contexts:
+                location_id = child_context["location_name"].rpartition("/")[2]
+                synced_streams = synced_child_streams.setdefault(location_id, [])
+
+                for child_stream in priority_streams:
+                    if child_stream.name in synced_streams:
+                        continue
+
+                    if self._tap.deadline_reached(self._longest_child_seconds):
+                        self.logger.info(
+                            "Sync deadline reached, stopping before '%s' for "
+                            "location '%s'.",
+                            child_stream.name,
+                            child_context["location_name"],
+                        )
+                        return
+
+                    started = time.monotonic()
+                    child_stream.sync(context=child_context)
+                    self._longest_child_seconds = max(
+                        self._longest_child_seconds, time.monotonic() - started
+                    )
+                    synced_streams.append(child_stream.name)
+                    self._write_progress()
+
+        if not self._tap.sync_stopped:
+            self.stream_state.pop("synced_child_streams")
+            self._write_progress()
+
+    def _write_progress(self) -> None:
+        # Child streams are synced after the accounts stream has written its final
+        # state, so updates to `synced_child_streams` are written out here
+        self._is_state_flushed = False
+        self._write_state_message()
+
+    @staticmethod
+    def _child_stream_priority(child_stream: GoogleBusinessStream) -> tuple:
+        # Child streams without a priority are synced last
+        return (child_stream.sync_priority is None, child_stream.sync_priority or 0)
+
 class LocationAdminsStream(GoogleBusinessStream):
     """Location Admins stream."""
 
     name = "location_admins"
     parent_stream_type = LocationsStream
+    sync_priority = 1
     path = "/{location_name}/admins"
     primary_keys = ["name"]
     records_jsonpath = "$.admins[*]"
@@ -156,6 +304,7 @@ class MultiDailyMetricsTimeSeriesStream(GoogleBusinessPerformanceStream):
 
     name = "multi_daily_metrics_time_series"
     parent_stream_type = LocationsStream
+    sync_priority = 0
     path = "/{location_name}:fetchMultiDailyMetricsTimeSeries"
     primary_keys = ["location_name"]
     records_jsonpath = "$.multiDailyMetricTimeSeries[*]"
@@ -189,6 +338,7 @@ class DailyMetricsTimeSeriesStream(GoogleBusinessPerformanceStream):
 
     name = "daily_metrics_time_series"
     parent_stream_type = LocationsStream
+    sync_priority = 0
     path = "/{location_name}:getDailyMetricsTimeSeries"
     primary_keys = ["location_name"]
     records_jsonpath = "$.timeSeries"
@@ -208,6 +358,7 @@ class SearchKeywordsImpressionsMonthlyStream(GoogleBusinessPerformanceStream):
 
     name = "search_keywords_impressions_monthly"
     parent_stream_type = LocationsStream
+    sync_priority = 2
     path = "/{location_name}/searchkeywords/impressions/monthly"
     primary_keys = ["location_name"]
     records_jsonpath = "$.searchKeywordsCounts[*]"
@@ -1,12 +1,18 @@
 """GoogleBusiness tap class."""
 
+import json
+import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import List, Optional
 
+import click
 from singer_sdk import Stream, Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
 from singer_sdk.exceptions import ConfigValidationError
 
+from tap_google_business.plan import build_plan
+from tap_google_business.profiling import Profiler
 from tap_google_business.streams import (
     AccountsStream,
     AccountAdminsStream,
@@ -41,6 +47,9 @@ class TapGoogleBusiness(Tap):
         required=True,
         secret=True,
     )
+    _deadline: Optional[float] = None
+    sync_stopped = False
+    profiler: Optional[Profiler] = None
     _end_date = datetime.now(timezone.utc).date()
     _start_date = _end_date - timedelta(days=90)
 
@@ -86,6 +95,39 @@ class TapGoogleBusiness(Tap):
             description="ISO end date for all of the streams that use date-based filtering. Defaults to the current day.",
             default=_end_date.isoformat(),
         ),
+        th.Property(
+            "plan_file",
+            th.StringType,
+            description="Path to a plan written by `--plan`. Accounts and locations are read from the plan rather than requested.",
+        ),
+        th.Property(
+            "plan_concurrency",
+            th.IntegerType,
+            description="Number of concurrent requests to assume when estimating wall time in `--plan` mode.",
+            default=1,
+        ),
+        th.Property(
+            "requests_per_minute",
+            th.IntegerType,
+            description="Request quota per minute to assume when estimating quota consumption and wall time in `--plan` mode.",
+            default=300,
+        ),
+        th.Property(
+            "sync_deadline_seconds",
+            th.IntegerType,
+            description="Number of seconds a sync may run for. No more accounts, locations or location streams are synced once the deadline is expected to be reached, and the next sync continues where it stopped.",
+        ),
+        th.Property(
+            "profiling_dir",
+            th.StringType,
+            description="Directory to write CPU, memory and timing profiles of the sync to. Can also be set with the `TAP_GOOGLE_BUSINESS_PROFILING_DIR` environment variable. Profiling is disabled if not provided.",
+        ),
+        th.Property(
+            "profiling_memory",
+            th.BooleanType,
+            description="Whether to trace peak memory per partition when profiling. Tracing memory slows the sync down considerably.",
+            default=True,
+        ),
     ).to_dict()
 
     def setup_mapper(self):
@@ -95,6 +137,45 @@ class TapGoogleBusiness(Tap):
         return super().setup_mapper()
 
         
+    def sync_all(self) -> None:
+        """Sync all streams.
+
+        Stops early at `sync_deadline_seconds` and profiles the sync to
+        `profiling_dir`, if provided.
+        """
+        sync_deadline_seconds = self.config.get("sync_deadline_seconds")
+        if sync_deadline_seconds:
+            self._deadline = time.monotonic() + sync_deadline_seconds
+
+        profiling_dir = self.config.get("profiling_dir") or os.environ.get(
+            "TAP_GOOGLE_BUSINESS_PROFILING_DIR"
+        )
+        if not profiling_dir:
+            super().sync_all()
+            return
+
+        self.profiler = Profiler(
+            profiling_dir,
+            self.logger,
+            trace_memory=self.config.get("profiling_memory", True),
+        )
+        self.profiler.start()
+        try:
+            super().sync_all()
+        finally:
+            self.profiler.stop()
+            self.logger.info("Profiles written to '%s'.", self.profiler.profiling_dir)
+
+    def deadline_reached(self, margin: float = 0) -> bool:
+        """Return whether the sync deadline is reached within `margin` seconds.
+
+        Once reached, `sync_stopped` is set for the rest of the sync.
+        """
+        if self._deadline and time.monotonic() + margin >= self._deadline:
+            self.sync_stopped = True
+
+        return self.sync_stopped
+
     def discover_streams(self) -> List[Stream]:
         """Return a list of discovered streams."""
         return [stream_class(tap=self) for stream_class in STREAM_TYPES]
@@ -129,5 +210,47 @@ class TapGoogleBusiness(Tap):
                 "Standard OAuth credentials will take precedence."
             )
 
+        for setting in ("plan_concurrency", "requests_per_minute"):
+            if self.config.get(setting, 1) < 1:
+                raise ConfigValidationError(f"'{setting}' must be at least 1.")
+
+    @classmethod
+    def invoke(cls, *, plan: bool = False, **kwargs) -> None:
+        """Invoke the tap's command line interface, in plan mode if `plan` is set.
+
+        The plan only includes the streams selected in the catalog, if provided.
+        """
+        if not plan or kwargs.get("about"):
+            super().invoke(**kwargs)
+            return
+
+        config_files, parse_env_config = cls.config_from_cli_args(
+            *kwargs.get("config", ())
+        )
+        tap = cls(
+            config=config_files,
+            catalog=kwargs.get("catalog"),
+            parse_env_config=parse_env_config,
+            validate_config=True,
+        )
+        click.echo(json.dumps(build_plan(tap), indent=2))
+
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        """Execute standard CLI handler for taps, with an added `--plan` option."""
+        command = super().get_singer_command()
+        command.params.append(
+            click.Option(
+                ["--plan"],
+                is_flag=True,
+                help=(
+                    "Enumerate accounts and locations and output the planned "
+                    "requests of a sync, with quota and wall time estimates."
+                ),
+            )
+        )
+
+        return command
+
 if __name__ == "__main__":
     TapGoogleBusiness.cli()
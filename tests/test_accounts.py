@@ -0,0 +1,56 @@
+"""Tests the accounts stream."""
+
+import itertools
+import unittest
+from unittest import mock
+
+import responses
+
+import tests.utils as test_utils
+
+
+class TestAccountsStream(unittest.TestCase):
+    """Test class for the accounts stream"""
+
+    def setUp(self):
+        self.mock_config = {
+            "client_id": "1234",
+            "client_secret": "1234",
+            "refresh_token": "1234",
+            "account_id": "1234567890",
+            "sync_deadline_seconds": 1,
+        }
+        responses.reset()
+
+    @responses.activate
+    def test_accounts_stop_at_sync_deadline(self):
+        """Test no accounts are synced once the sync deadline is reached"""
+
+        responses.add(
+            responses.POST,
+            "https://www.googleapis.com/oauth2/v4/token?refresh_token=1234&client_id=1234"
+            + "&client_secret=1234&grant_type=refresh_token",
+            json={"access_token": 12341234, "expires_in": 3622},
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts/1234567890",
+            json=test_utils.ACCOUNTS_RESPONSE,
+            status=200,
+        )
+
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config, ["accounts", "account_admins"]
+        )
+
+        # The deadline has passed by the time the first account is requested
+        with mock.patch("tap_google_business.tap.time") as mock_time:
+            mock_time.monotonic.side_effect = itertools.chain([0], itertools.repeat(2))
+            tap.sync_all()
+
+        self.assertTrue(tap.sync_stopped)
+        self.assertEqual(
+            [call.request.url for call in responses.calls][-1],
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts/1234567890",
+        )
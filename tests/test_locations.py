@@ -0,0 +1,244 @@
+"""Tests the locations stream."""
+
+import io
+import json
+import re
+import time
+from contextlib import redirect_stdout
+import unittest
+
+import responses
+
+from tap_google_business.tap import TapGoogleBusiness
+
+
+class TestLocationsStream(unittest.TestCase):
+    """Test class for the locations stream"""
+
+    def setUp(self):
+        self.mock_config = {
+            "client_id": "1234",
+            "client_secret": "1234",
+            "refresh_token": "1234",
+        }
+        responses.reset()
+
+        responses.add(
+            responses.POST,
+            "https://www.googleapis.com/oauth2/v4/token?refresh_token=1234&client_id=1234"
+            + "&client_secret=1234&grant_type=refresh_token",
+            json={"access_token": 12341234, "expires_in": 3622},
+            status=200,
+        )
+
+    @responses.activate
+    def test_locations_deduplicated_across_accounts(self):
+        """Test a location shared by several accounts is only emitted once"""
+
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts%2F1/locations",
+            json={"locations": [{"name": "locations/111"}, {"name": "locations/222"}]},
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts%2F2/locations",
+            json={"locations": [{"name": "locations/222"}, {"name": "locations/333"}]},
+            status=200,
+        )
+
+        stream = TapGoogleBusiness(config=self.mock_config).streams["locations"]
+
+        records = [
+            *stream.get_records({"account_name": "accounts/1"}),
+            *stream.get_records({"account_name": "accounts/2"}),
+        ]
+
+        self.assertEqual(
+            [record["name"] for record in records],
+            ["locations/111", "locations/222", "locations/333"],
+        )
+
+    @responses.activate
+    def test_locations_stop_at_sync_deadline(self):
+        """Test no more locations are emitted once the sync deadline is reached"""
+
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts%2F1/locations",
+            json={"locations": [{"name": "locations/111"}, {"name": "locations/222"}]},
+            status=200,
+        )
+
+        tap = TapGoogleBusiness(config=self.mock_config)
+        records = tap.streams["locations"].get_records({"account_name": "accounts/1"})
+
+        self.assertEqual(next(records)["name"], "locations/111")
+
+        tap._deadline = time.monotonic()
+
+        self.assertEqual(list(records), [])
+        self.assertTrue(tap.sync_stopped)
+
+    def sync_locations(self, tap):
+        stream = tap.streams["locations"]
+        for _ in stream._sync_records({"account_name": "accounts/1"}):
+            pass
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            stream.sync_location_streams()
+
+        self.states = [
+            message["value"]
+            for message in map(json.loads, stdout.getvalue().splitlines())
+            if message["type"] == "STATE"
+        ]
+        return stream
+
+    def location_requests(self):
+        return [
+            call.request.url.rpartition("/")[2]
+            for call in responses.calls
+            if "locations%2F" in call.request.url
+        ]
+
+    @responses.activate
+    def test_location_child_streams_synced_by_priority_until_sync_deadline(self):
+        """Test child streams are synced by priority across locations until the deadline"""
+
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts%2F1/locations",
+            json={"locations": [{"name": "locations/111"}, {"name": "locations/222"}]},
+            status=200,
+        )
+        responses.add(responses.GET, re.compile(".*locations%2F.*"), json={})
+
+        tap = TapGoogleBusiness(config={**self.mock_config, "account_id": "1"})
+
+        # The deadline is reached once the daily metrics of both locations are synced
+        def deadline_reached(margin=0):
+            daily_requests = [
+                request
+                for request in self.location_requests()
+                if "getDailyMetricsTimeSeries" in request
+            ]
+            if len(daily_requests) == 2:
+                tap.sync_stopped = True
+            return tap.sync_stopped
+
+        tap.deadline_reached = deadline_reached
+
+        stream = self.sync_locations(tap)
+
+        self.assertEqual(
+            [
+                request.partition(":")[2].partition("?")[0]
+                for request in self.location_requests()
+            ],
+            [
+                "fetchMultiDailyMetricsTimeSeries",
+                "getDailyMetricsTimeSeries",
+                "fetchMultiDailyMetricsTimeSeries",
+                "getDailyMetricsTimeSeries",
+            ],
+        )
+        self.assertEqual(
+            stream.stream_state["synced_child_streams"],
+            {
+                "111": ["multi_daily_metrics_time_series", "daily_metrics_time_series"],
+                "222": ["multi_daily_metrics_time_series", "daily_metrics_time_series"],
+            },
+        )
+        self.assertEqual(self.states[-1], tap.state)
+
+    @responses.activate
+    def test_location_child_streams_resume_after_sync_deadline(self):
+        """Test only child streams not synced before a previous deadline are synced"""
+
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts%2F1/locations",
+            json={"locations": [{"name": "locations/111"}]},
+            status=200,
+        )
+        responses.add(responses.GET, re.compile(".*locations%2F111.*"), json={})
+
+        tap = TapGoogleBusiness(
+            config={**self.mock_config, "account_id": "1"},
+            state={
+                "bookmarks": {
+                    "locations": {
+                        "synced_child_streams": {
+                            "111": [
+                                "multi_daily_metrics_time_series",
+                                "daily_metrics_time_series",
+                                "location_admins",
+                            ]
+                        }
+                    }
+                }
+            },
+        )
+
+        stream = self.sync_locations(tap)
+
+        self.assertEqual(self.location_requests(), ["monthly"])
+        self.assertNotIn("synced_child_streams", stream.stream_state)
+        self.assertNotIn(
+            "synced_child_streams", self.states[-1]["bookmarks"]["locations"]
+        )
+
+    @responses.activate
+    def test_location_child_streams_progress_kept_when_stopped_again(self):
+        """Test progress from a previous sync is kept when a resumed sync stops again"""
+
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts%2F1/locations",
+            json={"locations": [{"name": "locations/111"}, {"name": "locations/222"}]},
+            status=200,
+        )
+        responses.add(responses.GET, re.compile(".*locations%2F.*"), json={})
+
+        tap = TapGoogleBusiness(
+            config={**self.mock_config, "account_id": "1"},
+            state={
+                "bookmarks": {
+                    "locations": {
+                        "synced_child_streams": {
+                            "111": [
+                                "multi_daily_metrics_time_series",
+                                "daily_metrics_time_series",
+                            ]
+                        }
+                    }
+                }
+            },
+        )
+
+        # The deadline is reached once the daily metrics of location 222 are synced
+        def deadline_reached(margin=0):
+            if any(
+                "getDailyMetricsTimeSeries" in request
+                for request in self.location_requests()
+            ):
+                tap.sync_stopped = True
+            return tap.sync_stopped
+
+        tap.deadline_reached = deadline_reached
+
+        stream = self.sync_locations(tap)
+
+        self.assertEqual(
+            [request.partition(":")[0] for request in self.location_requests()],
+            ["locations%2F222", "locations%2F222"],
+        )
+        self.assertEqual(
+            stream.stream_state["synced_child_streams"],
+            {
+                "111": ["multi_daily_metrics_time_series", "daily_metrics_time_series"],
+                "222": ["multi_daily_metrics_time_series", "daily_metrics_time_series"],
+            },
+        )
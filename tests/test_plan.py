@@ -0,0 +1,140 @@
+"""Tests the request planner."""
+
+import json
+import tempfile
+import unittest
+
+import responses
+from click.testing import CliRunner
+from singer_sdk.exceptions import ConfigValidationError
+
+import tests.utils as test_utils
+from tap_google_business.plan import build_plan
+from tap_google_business.tap import TapGoogleBusiness
+
+
+class TestPlan(unittest.TestCase):
+    """Test class for the request planner"""
+
+    def setUp(self):
+        self.mock_config = {
+            "client_id": "1234",
+            "client_secret": "1234",
+            "refresh_token": "1234",
+            "account_id": "1",
+            "requests_per_minute": 60,
+        }
+        responses.reset()
+
+    def add_enumeration_responses(self):
+        responses.add(
+            responses.POST,
+            "https://www.googleapis.com/oauth2/v4/token?refresh_token=1234&client_id=1234"
+            + "&client_secret=1234&grant_type=refresh_token",
+            json={"access_token": 12341234, "expires_in": 3622},
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts/1",
+            json={"name": "accounts/1"},
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts%2F1/locations",
+            json={"locations": [{"name": "locations/111"}, {"name": "locations/222"}]},
+            status=200,
+        )
+
+    @responses.activate
+    def test_plan_counts_requests_per_stream(self):
+        """Test requests are planned per account and location"""
+
+        self.add_enumeration_responses()
+
+        plan = build_plan(TapGoogleBusiness(config=self.mock_config))
+
+        self.assertEqual(plan["accounts"], [{"name": "accounts/1"}])
+        self.assertEqual(
+            plan["locations"],
+            {"accounts/1": [{"name": "locations/111"}, {"name": "locations/222"}]},
+        )
+        self.assertEqual(plan["enumeration_requests"], 2)
+        self.assertEqual(
+            plan["requests"],
+            {
+                "account_admins": 1,
+                "location_admins": 2,
+                "multi_daily_metrics_time_series": 2,
+                "daily_metrics_time_series": 2,
+                "search_keywords_impressions_monthly": 2,
+            },
+        )
+        self.assertEqual(plan["total_requests"], 9)
+        self.assertEqual(plan["estimate"]["without_plan_file"]["requests"], 11)
+        self.assertEqual(plan["estimate"]["without_plan_file"]["quota_minutes"], 0.18)
+        self.assertEqual(plan["estimate"]["with_plan_file"]["requests"], 9)
+        self.assertEqual(plan["estimate"]["with_plan_file"]["quota_minutes"], 0.15)
+
+    def test_plan_settings_must_be_at_least_one(self):
+        """Test a plan concurrency or request quota below 1 is rejected"""
+
+        for setting in ("plan_concurrency", "requests_per_minute"):
+            with self.subTest(setting=setting):
+                with self.assertRaises(ConfigValidationError):
+                    TapGoogleBusiness(config={**self.mock_config, setting: 0})
+
+    @responses.activate
+    def test_plan_excludes_deselected_streams(self):
+        """Test streams deselected in the catalog given to --plan are not planned"""
+
+        self.add_enumeration_responses()
+
+        catalog = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config, ["accounts", "locations", "location_admins"]
+        ).catalog_dict
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_path = f"{tmp_dir}/config.json"
+            catalog_path = f"{tmp_dir}/catalog.json"
+            with open(config_path, "w") as f:
+                json.dump(self.mock_config, f)
+            with open(catalog_path, "w") as f:
+                json.dump(catalog, f)
+
+            result = CliRunner().invoke(
+                TapGoogleBusiness.cli,
+                ["--config", config_path, "--catalog", catalog_path, "--plan"],
+            )
+
+        plan = json.loads(result.stdout)
+
+        self.assertEqual(plan["requests"], {"location_admins": 2})
+        self.assertEqual(plan["total_requests"], 2)
+
+    @responses.activate
+    def test_sync_reads_accounts_and_locations_from_plan(self):
+        """Test accounts and locations are not requested when a plan is provided"""
+
+        plan = {
+            "accounts": [{"name": "accounts/1"}],
+            "locations": {"accounts/1": [{"name": "locations/111"}]},
+        }
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as plan_file:
+            json.dump(plan, plan_file)
+            plan_file.flush()
+
+            tap = TapGoogleBusiness(
+                config={**self.mock_config, "plan_file": plan_file.name}
+            )
+
+            accounts = list(tap.streams["accounts"].get_records(None))
+            locations = list(
+                tap.streams["locations"].get_records({"account_name": "accounts/1"})
+            )
+
+        self.assertEqual(accounts, plan["accounts"])
+        self.assertEqual(locations, plan["locations"]["accounts/1"])
+        self.assertEqual(len(responses.calls), 0)
@@ -0,0 +1,79 @@
+"""Tests profiling of the tap."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import responses
+
+import tests.utils as test_utils
+
+
+class TestProfiling(unittest.TestCase):
+    """Test class for profiling of the tap"""
+
+    def setUp(self):
+        self.mock_config = {
+            "client_id": "1234",
+            "client_secret": "1234",
+            "refresh_token": "1234",
+            "account_id": "1234567890",
+        }
+        responses.reset()
+
+    def add_accounts_responses(self):
+        responses.add(
+            responses.POST,
+            "https://www.googleapis.com/oauth2/v4/token?refresh_token=1234&client_id=1234"
+            + "&client_secret=1234&grant_type=refresh_token",
+            json={"access_token": 12341234, "expires_in": 3622},
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            "https://mybusinessaccountmanagement.googleapis.com/v1/accounts/1234567890",
+            json=test_utils.ACCOUNTS_RESPONSE,
+            status=200,
+        )
+
+    @responses.activate
+    def test_sync_writes_profile(self):
+        """Test a profiled sync writes timings and partition peak memory"""
+
+        self.add_accounts_responses()
+
+        with tempfile.TemporaryDirectory() as profiling_dir:
+            tap = test_utils.set_up_tap_with_custom_catalog(
+                {**self.mock_config, "profiling_dir": profiling_dir}, ["accounts"]
+            )
+            tap.sync_all()
+
+            with open(os.path.join(tap.profiler.profiling_dir, "profile.json")) as f:
+                profile = json.load(f)
+
+        self.assertEqual(
+            set(profile["timings"]["accounts"]), {"request", "parse", "map", "write"}
+        )
+        self.assertEqual(len(profile["partitions"]), 1)
+        self.assertEqual(profile["partitions"][0]["stream"], "accounts")
+        self.assertGreater(profile["partitions"][0]["peak_memory_bytes"], 0)
+
+    @responses.activate
+    def test_sync_profiled_off_main_thread(self):
+        """Test a profiled sync runs without CPU sampling off the main thread"""
+
+        self.add_accounts_responses()
+
+        with tempfile.TemporaryDirectory() as profiling_dir:
+            tap = test_utils.set_up_tap_with_custom_catalog(
+                {**self.mock_config, "profiling_dir": profiling_dir}, ["accounts"]
+            )
+            thread = threading.Thread(target=tap.sync_all)
+            thread.start()
+            thread.join()
+
+            self.assertEqual(
+                os.listdir(tap.profiler.profiling_dir), ["profile.json"]
+            )